@@ -175,18 +175,23 @@ class LoggerHook(Hook):
             data_batch (dict tuple or list, optional): Data from dataloader.
             outputs (dict, optional): Outputs from model.
         """
+        # `len(runner.train_dataloader)` may be expensive for some samplers
+        # or dataset wrappers, so the length cached by the train loop is used
+        # if it is available.
+        iters_per_epoch = getattr(runner.train_loop, 'iters_per_epoch', None)
+        if not isinstance(iters_per_epoch, int):
+            iters_per_epoch = len(runner.train_dataloader)
+        end_of_epoch = batch_idx + 1 == iters_per_epoch
         # Print experiment name every n iterations.
-        if self.every_n_train_iters(
-                runner, self.interval_exp_name) or (self.end_of_epoch(
-                    runner.train_dataloader, batch_idx)):
+        if self.every_n_train_iters(runner,
+                                    self.interval_exp_name) or end_of_epoch:
             exp_info = f'Exp name: {runner.experiment_name}'
             runner.logger.info(exp_info)
         if self.every_n_inner_iters(batch_idx, self.interval):
             tag, log_str = runner.log_processor.get_log_after_iter(
                 runner, batch_idx, 'train')
-        elif (self.end_of_epoch(runner.train_dataloader, batch_idx)
-              and (not self.ignore_last
-                   or len(runner.train_dataloader) <= self.interval)):
+        elif (end_of_epoch
+              and (not self.ignore_last or iters_per_epoch <= self.interval)):
             # `runner.max_iters` may not be divisible by `self.interval`. if
             # `self.ignore_last==True`, the log of remaining iterations will
             # be recorded (Epoch [4][1000/1007], the logs of 998-1007
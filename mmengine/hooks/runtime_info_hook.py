@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Any, Dict, Optional, Union
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -30,6 +31,36 @@ def _is_scalar(value: Any) -> bool:
     return False
 
 
+def _tensors_to_scalars(log_dict: dict) -> dict:
+    """Convert single-element tensors in ``log_dict`` to python numbers.
+
+    Tensors with the same device and dtype are stacked and copied to the host
+    together, which synchronizes with the device once per group instead of
+    calling ``item()`` for each of them.
+
+    Args:
+        log_dict (dict): Dict of log values.
+
+    Returns:
+        dict: A new dict whose single-element tensors are converted to python
+        numbers. Other values are kept as they are.
+    """
+    groups: Dict[Tuple[torch.device, torch.dtype],
+                 List[str]] = defaultdict(list)
+    for key, value in log_dict.items():
+        if isinstance(value, torch.Tensor) and value.numel() == 1:
+            groups[(value.device, value.dtype)].append(key)
+    if not groups:
+        return log_dict
+
+    log_dict = dict(log_dict)
+    for keys in groups.values():
+        values = torch.stack(
+            [log_dict[key].detach().reshape(()) for key in keys]).tolist()
+        log_dict.update(zip(keys, values))
+    return log_dict
+
+
 @HOOKS.register_module()
 class RuntimeInfoHook(Hook):
     """A hook that updates runtime information into message hub.
@@ -122,8 +153,8 @@ class RuntimeInfoHook(Hook):
             outputs (dict, optional): Outputs from model. Defaults to None.
         """
         if outputs is not None:
-            for key, value in outputs.items():
-                runner.message_hub.update_scalar(f'train/{key}', value)
+            runner.message_hub.update_scalars(
+                _tensors_to_scalars(outputs), prefix='train/')
 
     def before_val(self, runner) -> None:
         self.last_loop_stage = runner.message_hub.get_info('loop_stage')
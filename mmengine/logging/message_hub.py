@@ -137,7 +137,10 @@ class MessageHub(ManagerMixin):
         else:
             self._log_scalars[key] = HistoryBuffer([checked_value], [count])
 
-    def update_scalars(self, log_dict: dict, resumed: bool = True) -> None:
+    def update_scalars(self,
+                       log_dict: dict,
+                       resumed: bool = True,
+                       prefix: str = '') -> None:
         """Update :attr:`_log_scalars` with a dict.
 
         ``update_scalars`` iterates through each pair of log_dict key-value,
@@ -153,6 +156,8 @@ class MessageHub(ManagerMixin):
             log_dict (str): Used for batch updating :attr:`_log_scalars`.
             resumed (bool): Whether all ``HistoryBuffer`` referred in
                 log_dict should be resumed. Defaults to True.
+            prefix (str): Prefix added to each key of ``log_dict``, e.g.
+                ``'train/'``. Defaults to ''.
 
         Examples:
             >>> message_hub = MessageHub.get_instance('mmengine')
@@ -162,6 +167,8 @@ class MessageHub(ManagerMixin):
             >>> log_dict = dict(a=1, b=2, c=dict(value=1, count=2))
             >>> message_hub.update_scalars(log_dict)
             >>> # The count of `c` is 2.
+            >>> message_hub.update_scalars(dict(loss=1), prefix='train/')
+            >>> # `train/loss` is updated.
         """
         assert isinstance(log_dict, dict), ('`log_dict` must be a dict!, '
                                             f'but got {type(log_dict)}')
@@ -177,7 +184,7 @@ class MessageHub(ManagerMixin):
             assert isinstance(count,
                               int), ('The type of count must be int. but got '
                                      f'{type(count): {count}}')
-            self.update_scalar(log_name, value, count, resumed)
+            self.update_scalar(prefix + log_name, value, count, resumed)
 
     def update_info(self, key: str, value: Any, resumed: bool = True) -> None:
         """Update runtime information.
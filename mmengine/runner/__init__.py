@@ -10,6 +10,7 @@ from .checkpoint import (CheckpointLoader, find_latest_checkpoint,
                          load_state_dict, save_checkpoint, weights_to_cpu)
 from .log_processor import LogProcessor
 from .loops import EpochBasedTrainLoop, IterBasedTrainLoop, TestLoop, ValLoop
+from .prefetcher import CUDAPrefetcher
 from .priority import Priority, get_priority
 from .runner import Runner
 from .utils import set_random_seed
@@ -21,5 +22,5 @@ __all__ = [
     'save_checkpoint', 'EpochBasedTrainLoop', 'IterBasedTrainLoop', 'ValLoop',
     'TestLoop', 'Runner', 'get_priority', 'Priority', 'find_latest_checkpoint',
     'autocast', 'LogProcessor', 'set_random_seed', 'FlexibleRunner',
-    'turn_on_activation_checkpointing'
+    'turn_on_activation_checkpointing', 'CUDAPrefetcher'
 ]
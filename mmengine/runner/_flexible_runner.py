@@ -5,7 +5,7 @@ import os.path as osp
 import pickle
 import warnings
 from functools import partial
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import torch.nn as nn
 from torch.utils.data import DataLoader
@@ -31,7 +31,7 @@ from .checkpoint import find_latest_checkpoint
 from .log_processor import LogProcessor
 from .loops import EpochBasedTrainLoop, IterBasedTrainLoop, TestLoop, ValLoop
 from .priority import Priority, get_priority
-from .utils import _get_batch_size
+from .utils import _get_batch_size, _get_triggered_hooks
 
 ConfigType = Union[Dict, Config, ConfigDict]
 ParamSchedulerType = Union[List[_ParamScheduler], Dict[str,
@@ -399,6 +399,12 @@ class FlexibleRunner:
             self.visualizer.add_config(self.cfg)
 
         self._hooks: List[Hook] = []
+        # hooks which will act in each stage, lazily filtered from
+        # `self._hooks` and reset once hooks are changed
+        self._triggered_hooks: Dict[str, List[Hook]] = {}
+        # `self._hooks` and its length when `self._triggered_hooks` is
+        # filled, to detect hooks added or removed without `register_hook`
+        self._triggered_hooks_stamp: Tuple[List[Hook], int] = (self._hooks, 0)
         # register hooks to `self._hooks`
         self.register_hooks(default_hooks, custom_hooks)
         # log hooks information
@@ -540,7 +546,14 @@ class FlexibleRunner:
 
     @property
     def hooks(self):
-        """list[:obj:`Hook`]: A list of registered hooks."""
+        """list[:obj:`Hook`]: A list of registered hooks.
+
+        Hooks should be registered by :meth:`register_hook`. The hooks
+        triggered by each stage are cached, and the cache is only refreshed
+        when hooks are registered, or added to or removed from this list.
+        Other direct modifications, e.g., replacing an item of this list or
+        assigning a stage method to a registered hook, are not supported.
+        """
         return self._hooks
 
     @property
@@ -1264,14 +1277,71 @@ class FlexibleRunner:
                 "before_train_epoch".
             **kwargs: Keyword arguments passed to hook.
         """
-        for hook in self._hooks:
-            # support adding additional custom hook methods
-            if hasattr(hook, fn_name):
+        for hook in self._get_hooks_to_call(fn_name):
+            try:
+                getattr(hook, fn_name)(self, **kwargs)
+            except TypeError as e:
+                raise TypeError(f'{e} in {hook}') from e
+
+    def _get_hooks_to_call(self, fn_name: str) -> List[Hook]:
+        """Get the cached hooks which will act when ``fn_name`` is called.
+
+        Args:
+            fn_name (str): The function name in each hook, such as
+                "before_train_iter".
+
+        Returns:
+            List[Hook]: Hooks triggered by ``fn_name``.
+        """
+        hooks, num_hooks = self._triggered_hooks_stamp
+        if hooks is not self._hooks or num_hooks != len(self._hooks):
+            self._triggered_hooks.clear()
+            self._triggered_hooks_stamp = (self._hooks, len(self._hooks))
+        triggered_hooks = self._triggered_hooks.get(fn_name)
+        if triggered_hooks is None:
+            triggered_hooks = _get_triggered_hooks(self._hooks, fn_name)
+            self._triggered_hooks[fn_name] = triggered_hooks
+        return triggered_hooks
+
+    def _make_hook_caller(self, fn_name: str) -> Callable[..., None]:
+        """Make a function which calls ``fn_name`` of all hooks.
+
+        The returned function is equivalent to
+        ``partial(self.call_hook, fn_name)``, but it binds the methods of the
+        triggered hooks once and reuses them until the hooks are changed,
+        which saves the lookups of :meth:`call_hook` on the hot path of loops.
+
+        Args:
+            fn_name (str): The function name in each hook to be called, such as
+                "before_train_iter".
+
+        Returns:
+            Callable: A function accepting the keyword arguments passed to
+            hooks.
+        """
+        if type(self).call_hook is not FlexibleRunner.call_hook:
+            # Respect `call_hook` overridden by subclasses.
+            return partial(self.call_hook, fn_name)
+
+        bound_hooks: Optional[List[Hook]] = None
+        methods: List[tuple] = []
+
+        def hook_caller(**kwargs) -> None:
+            nonlocal bound_hooks, methods
+            hooks = self._get_hooks_to_call(fn_name)
+            # `_triggered_hooks` is reset once hooks are changed, so a new
+            # list means the methods should be bound again.
+            if hooks is not bound_hooks:
+                bound_hooks = hooks
+                methods = [(hook, getattr(hook, fn_name)) for hook in hooks]
+            for hook, method in methods:
                 try:
-                    getattr(hook, fn_name)(self, **kwargs)
+                    method(self, **kwargs)
                 except TypeError as e:
                     raise TypeError(f'{e} in {hook}') from e
 
+        return hook_caller
+
     def register_hook(
         self,
         hook: Union[Hook, Dict],
@@ -1325,6 +1395,7 @@ class FlexibleRunner:
                 break
         if not inserted:
             self._hooks.insert(0, hook_obj)
+        self._triggered_hooks.clear()
 
     def register_default_hooks(
         self,
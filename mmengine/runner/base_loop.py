@@ -1,9 +1,16 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import copy
+import logging
 from abc import ABCMeta, abstractmethod
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
 
+import torch
 from torch.utils.data import DataLoader
 
+from mmengine.device import is_cuda_available
+from mmengine.logging import print_log
+from .prefetcher import CUDAPrefetcher
+
 
 class BaseLoop(metaclass=ABCMeta):
     """Base loop class.
@@ -11,27 +18,83 @@ class BaseLoop(metaclass=ABCMeta):
     All subclasses inherited from ``BaseLoop`` should overwrite the
     :meth:`run` method.
 
+    Note:
+        If ``dataloader`` is a dict, ``pin_memory`` defaults to True when CUDA
+        is available, and ``persistent_workers`` defaults to True when
+        ``num_workers`` is greater than 0, so that batches can be copied to
+        GPU asynchronously and workers are not re-created every epoch.
+
     Args:
         runner (Runner): A reference of runner.
         dataloader (Dataloader or dict): An iterator to generate one batch of
             dataset each iteration.
+        prefetch (bool): Whether to copy the next batch to GPU on a side
+            CUDA stream while the current batch is being computed when
+            iterating with :meth:`_iterate`. Defaults to False.
+        memory_format (str or torch.memory_format, optional): The memory
+            format which 4-D tensors of batches are converted to once they
+            are prefetched. See :class:`CUDAPrefetcher` for more details.
+            Defaults to None.
     """
 
-    def __init__(self, runner, dataloader: Union[DataLoader, Dict]) -> None:
+    def __init__(
+        self,
+        runner,
+        dataloader: Union[DataLoader, Dict],
+        prefetch: bool = False,
+        memory_format: Optional[Union[str,
+                                      torch.memory_format]] = None) -> None:
         self._runner = runner
         if isinstance(dataloader, dict):
-            # Determine whether or not different ranks use different seed.
-            diff_rank_seed = runner._randomness_cfg.get(
-                'diff_rank_seed', False)
-            self.dataloader = runner.build_dataloader(
-                dataloader, seed=runner.seed, diff_rank_seed=diff_rank_seed)
+            self.dataloader = self._build_dataloader(dataloader)
         else:
+            if is_cuda_available() and isinstance(
+                    dataloader, DataLoader) and not dataloader.pin_memory:
+                print_log(
+                    '`pin_memory` of the dataloader is disabled, which may '
+                    'slow down copying data to GPU. It is recommended to '
+                    'build the dataloader with `pin_memory=True`.',
+                    logger='current',
+                    level=logging.WARNING)
             self.dataloader = dataloader
+        self.prefetcher = CUDAPrefetcher(
+            self.dataloader, memory_format=memory_format) if prefetch else None
+
+    def _build_dataloader(self, dataloader: Dict) -> DataLoader:
+        """Build dataloader with efficient default arguments.
+
+        Args:
+            dataloader (dict): A dict to build a dataloader.
+
+        Returns:
+            DataLoader: DataLoader built from ``dataloader``.
+        """
+        dataloader = copy.copy(dataloader)
+        dataloader.setdefault('pin_memory', is_cuda_available())
+        if dataloader.get('num_workers', 0) > 0:
+            dataloader.setdefault('persistent_workers', True)
+        # Determine whether or not different ranks use different seed.
+        diff_rank_seed = self.runner._randomness_cfg.get(
+            'diff_rank_seed', False)
+        return self.runner.build_dataloader(
+            dataloader, seed=self.runner.seed, diff_rank_seed=diff_rank_seed)
 
     @property
     def runner(self):
         return self._runner
 
+    def _iterate(self) -> Iterator[Tuple[int, Any]]:
+        """Iterate over ``self.dataloader`` for one epoch.
+
+        Returns:
+            Iterator[Tuple[int, Any]]: An iterator yielding the index and
+            data of each batch. Data is copied to GPU in advance if
+            ``prefetch`` is enabled.
+        """
+        if self.prefetcher is None:
+            return enumerate(self.dataloader)
+        return enumerate(self.prefetcher)
+
     @abstractmethod
     def run(self) -> Any:
         """Execute loop."""
@@ -2,19 +2,43 @@
 import bisect
 import logging
 import time
-from typing import Dict, List, Optional, Sequence, Tuple, Union
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import torch
 from torch.utils.data import DataLoader
 
+from mmengine.device import is_cuda_available
+from mmengine.dist import all_reduce
 from mmengine.evaluator import Evaluator
 from mmengine.logging import print_log
+from mmengine.model import is_model_wrapper
+from mmengine.optim import OptimWrapper
 from mmengine.registry import LOOPS
+from mmengine.structures import BaseDataElement
+from mmengine.utils import digit_version
+from mmengine.utils.dl_utils import TORCH_VERSION
 from .amp import autocast
 from .base_loop import BaseLoop
+from .prefetcher import CUDAPrefetcher, _to_device
 from .utils import calc_dynamic_intervals
 
 
+def _no_grad(inference_mode: bool = False):
+    """Get a context manager which disables gradient calculation.
+
+    Args:
+        inference_mode (bool): Whether to use ``torch.inference_mode``, which
+            is available since PyTorch 1.9.0, instead of ``torch.no_grad``.
+            Defaults to False.
+    """
+    if inference_mode and (digit_version(TORCH_VERSION) >=
+                           digit_version('1.9.0')):
+        return torch.inference_mode()
+    return torch.no_grad()
+
+
 @LOOPS.register_module()
 class EpochBasedTrainLoop(BaseLoop):
     """Loop for epoch-based training.
@@ -31,21 +55,37 @@ class EpochBasedTrainLoop(BaseLoop):
             first element in the tuple is a milestone and the second
             element is a interval. The interval is used after the
             corresponding milestone. Defaults to None.
+        prefetch (bool): Whether to copy the next batch to GPU on a side
+            CUDA stream while the current batch is being computed. It is
+            recommended to enable ``pin_memory`` of the dataloader at the
+            same time. Defaults to False.
+        memory_format (str or torch.memory_format, optional): The memory
+            format which 4-D tensors of batches are converted to once they
+            are prefetched, e.g., ``'channels_last'``. It only takes effect
+            when ``prefetch`` is True. The model should be converted to the
+            same memory format as well. Defaults to None.
     """
 
     def __init__(
-            self,
-            runner,
-            dataloader: Union[DataLoader, Dict],
-            max_epochs: int,
-            val_begin: int = 1,
-            val_interval: int = 1,
-            dynamic_intervals: Optional[List[Tuple[int, int]]] = None) -> None:
-        super().__init__(runner, dataloader)
+        self,
+        runner,
+        dataloader: Union[DataLoader, Dict],
+        max_epochs: int,
+        val_begin: int = 1,
+        val_interval: int = 1,
+        dynamic_intervals: Optional[List[Tuple[int, int]]] = None,
+        prefetch: bool = False,
+        memory_format: Optional[Union[str,
+                                      torch.memory_format]] = None) -> None:
+        super().__init__(runner, dataloader, prefetch, memory_format)
         self._max_epochs = int(max_epochs)
         assert self._max_epochs == max_epochs, \
             f'`max_epochs` should be a integer number, but get {max_epochs}.'
-        self._max_iters = self._max_epochs * len(self.dataloader)
+        # `len(dataloader)` may be expensive for some samplers or dataset
+        # wrappers, so it is cached and read by hooks through
+        # `iters_per_epoch` in each iteration.
+        self._iters_per_epoch = len(self.dataloader)
+        self._max_iters = self._max_epochs * self._iters_per_epoch
         self._epoch = 0
         self._iter = 0
         self.val_begin = val_begin
@@ -53,6 +93,9 @@ class EpochBasedTrainLoop(BaseLoop):
         # This attribute will be updated by `EarlyStoppingHook`
         # when it is enabled.
         self.stop_training = False
+        # Hooks called in each iteration.
+        self._call_before_iter = runner._make_hook_caller('before_train_iter')
+        self._call_after_iter = runner._make_hook_caller('after_train_iter')
         if hasattr(self.dataloader.dataset, 'metainfo'):
             self.runner.visualizer.dataset_meta = \
                 self.dataloader.dataset.metainfo
@@ -78,6 +121,11 @@ class EpochBasedTrainLoop(BaseLoop):
         """int: Total iterations to train model."""
         return self._max_iters
 
+    @property
+    def iters_per_epoch(self):
+        """int: Iterations of each epoch."""
+        return self._iters_per_epoch
+
     @property
     def epoch(self):
         """int: Current epoch."""
@@ -108,7 +156,7 @@ class EpochBasedTrainLoop(BaseLoop):
         """Iterate one epoch."""
         self.runner.call_hook('before_train_epoch')
         self.runner.model.train()
-        for idx, data_batch in enumerate(self.dataloader):
+        for idx, data_batch in self._iterate():
             self.run_iter(idx, data_batch)
 
         self.runner.call_hook('after_train_epoch')
@@ -120,19 +168,16 @@ class EpochBasedTrainLoop(BaseLoop):
         Args:
             data_batch (Sequence[dict]): Batch of data from dataloader.
         """
-        self.runner.call_hook(
-            'before_train_iter', batch_idx=idx, data_batch=data_batch)
+        runner = self.runner
+        self._call_before_iter(batch_idx=idx, data_batch=data_batch)
         # Enable gradient accumulation mode and avoid unnecessary gradient
         # synchronization during gradient accumulation process.
         # outputs should be a dict of loss.
-        outputs = self.runner.model.train_step(
-            data_batch, optim_wrapper=self.runner.optim_wrapper)
-
-        self.runner.call_hook(
-            'after_train_iter',
-            batch_idx=idx,
-            data_batch=data_batch,
-            outputs=outputs)
+        outputs = runner.model.train_step(
+            data_batch, optim_wrapper=runner.optim_wrapper)
+
+        self._call_after_iter(
+            batch_idx=idx, data_batch=data_batch, outputs=outputs)
         self._iter += 1
 
     def _decide_current_val_interval(self) -> None:
@@ -141,14 +186,180 @@ class EpochBasedTrainLoop(BaseLoop):
         self.val_interval = self.dynamic_intervals[step - 1]
 
 
+def _get_num_samples(data_batch: Any) -> int:
+    """Get the number of samples in a batch of data.
+
+    The batch is expected to be collated by ``pseudo_collate`` or
+    ``default_collate``, whose fields are either tensors batched along the
+    first dimension or sequences with one item for each sample.
+    """
+    if isinstance(data_batch, Mapping):
+        # e.g. dict(inputs=[...], data_samples=[...]) from `pseudo_collate`
+        if 'data_samples' in data_batch:
+            field = data_batch['data_samples']
+        else:
+            field = next(iter(data_batch.values()), None)
+    elif (isinstance(data_batch, Sequence)
+          and not isinstance(data_batch, (str, bytes))):
+        # e.g. [inputs, labels] collated from tuples by `default_collate`
+        field = data_batch[0] if len(data_batch) > 0 else None
+    else:
+        field = data_batch
+
+    if isinstance(field, Mapping):
+        # e.g. dict(inputs=dict(img=[...]))
+        return _get_num_samples(field)
+    elif isinstance(field, torch.Tensor):
+        return field.size(0) if field.dim() > 0 else 1
+    elif isinstance(field, Sequence) and not isinstance(field, (str, bytes)):
+        return len(field)
+    return 1
+
+
+def _get_dataset_size(dataset: Any, num_samples: int) -> int:
+    """Get the length of the entire dataset passed to ``Evaluator.evaluate``.
+
+    Datasets without ``__len__`` (e.g. ``IterableDataset``) may only be
+    sized by a full scan, so the number of samples processed by all ranks is
+    used instead.
+
+    Args:
+        dataset: The dataset of the dataloader.
+        num_samples (int): Number of samples processed by the current rank.
+
+    Returns:
+        int: The length of the entire dataset.
+    """
+    if hasattr(dataset, '__len__'):
+        return len(dataset)
+    size = torch.tensor(num_samples, dtype=torch.int64)
+    all_reduce(size)
+    return int(size.item())
+
+
+def _copy_data(dst: Any, src: Any) -> None:
+    """Recursively copy tensors in ``src`` to the corresponding tensors in
+    ``dst`` which has the same structure.
+
+    Raises:
+        ValueError: If ``src`` and ``dst`` have different structures, lengths
+            or tensor shapes.
+    """
+
+    def check_type(expected_type):
+        if not isinstance(dst, expected_type):
+            raise ValueError(f'expect {type(dst)} but got {type(src)}')
+
+    if isinstance(src, Mapping):
+        check_type(Mapping)
+        if set(dst) != set(src):
+            raise ValueError(f'expect keys {list(dst)} but got {list(src)}')
+        for key in src:
+            _copy_data(dst[key], src[key])
+    elif isinstance(src, BaseDataElement):
+        check_type(BaseDataElement)
+        if set(dst.keys()) != set(src.keys()):
+            raise ValueError(f'expect keys {dst.keys()} but got {src.keys()}')
+        for key, value in src.items():
+            _copy_data(dst.get(key), value)
+    elif isinstance(src, Sequence) and not isinstance(src, (str, bytes)):
+        check_type(Sequence)
+        if len(dst) != len(src):
+            raise ValueError(
+                f'expect a sequence of length {len(dst)} but got {len(src)}')
+        for dst_item, src_item in zip(dst, src):
+            _copy_data(dst_item, src_item)
+    elif isinstance(src, torch.Tensor):
+        check_type(torch.Tensor)
+        if dst.shape != src.shape or dst.dtype != src.dtype:
+            raise ValueError(
+                f'expect a tensor with shape {tuple(dst.shape)} and dtype '
+                f'{dst.dtype} but got {tuple(src.shape)} and {src.dtype}')
+        dst.copy_(src, non_blocking=True)
+
+
+class _EvaluatorProcessor:
+    """Call ``evaluator.process`` in the current thread or in a background
+    thread.
+
+    In asynchronous mode, ``evaluator.process`` of the current batch runs in a
+    single background thread while the model is forwarding the next batch.
+    At most one call is pending, so that ``evaluator.process`` is still
+    called in order and never concurrently. Asynchronous mode only takes
+    effect inside the ``with`` block, which waits for the pending call on
+    exit.
+
+    Args:
+        async_process (bool): Whether to call ``evaluator.process`` in a
+            background thread. Defaults to False.
+        inference_mode (bool): Whether to call ``evaluator.process`` in the
+            background thread under ``torch.inference_mode``. Defaults to
+            False.
+    """
+
+    def __init__(self,
+                 async_process: bool = False,
+                 inference_mode: bool = False) -> None:
+        self.async_process = async_process
+        self.inference_mode = inference_mode
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Optional[Future] = None
+
+    def __enter__(self) -> '_EvaluatorProcessor':
+        if self.async_process and is_cuda_available():
+            # The current CUDA device is thread local, so it should be set
+            # in the background thread as well.
+            self._pool = ThreadPoolExecutor(
+                max_workers=1,
+                initializer=torch.cuda.set_device,
+                initargs=(torch.cuda.current_device(), ))
+        elif self.async_process:
+            self._pool = ThreadPoolExecutor(max_workers=1)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+        # Only raise the error of the pending call if no other error occurs.
+        if exc_type is None:
+            self.wait()
+        self._pending = None
+
+    def wait(self) -> None:
+        """Wait for the pending call and raise its error if any."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending.result()
+
+    def process(self, evaluator: Evaluator, data_samples: Any,
+                data_batch: Any) -> None:
+        """Call ``evaluator.process`` with ``data_samples`` and
+        ``data_batch``."""
+        if self._pool is None:
+            evaluator.process(data_samples=data_samples, data_batch=data_batch)
+            return
+        self.wait()
+        self._pending = self._pool.submit(self._process, evaluator,
+                                          data_samples, data_batch)
+
+    def _process(self, evaluator: Evaluator, data_samples: Any,
+                 data_batch: Any) -> None:
+        # Grad mode is thread local, so it should be set again in the
+        # background thread.
+        with _no_grad(self.inference_mode):
+            evaluator.process(data_samples=data_samples, data_batch=data_batch)
+
+
 class _InfiniteDataloaderIterator:
     """An infinite dataloader iterator wrapper for IterBasedTrainLoop.
 
     It resets the dataloader to continue iterating when the iterator has
     iterated over all the data. However, this approach is not efficient, as the
-    workers need to be restarted every time the dataloader is reset. It is
-    recommended to use `mmengine.dataset.InfiniteSampler` to enable the
-    dataloader to iterate infinitely.
+    workers need to be restarted every time the dataloader is reset, unless
+    ``persistent_workers`` of the dataloader is True. It is recommended to use
+    `mmengine.dataset.InfiniteSampler` to enable the dataloader to iterate
+    infinitely.
     """
 
     def __init__(self, dataloader: DataLoader) -> None:
@@ -184,7 +395,11 @@ class _InfiniteDataloaderIterator:
                 # sampler. batch sampler in pytorch warps the sampler as its
                 # attributes.
                 self._dataloader.batch_sampler.sampler.set_epoch(self._epoch)
-            time.sleep(2)  # Prevent possible deadlock during epoch transition
+            # Persistent workers are reused rather than shut down, so there is
+            # no need to wait for them at the epoch transition.
+            if not getattr(self._dataloader, 'persistent_workers', False):
+                # Prevent possible deadlock during epoch transition
+                time.sleep(2)
             self._iterator = iter(self._dataloader)
             data = next(self._iterator)
         return data
@@ -194,6 +409,12 @@ class _InfiniteDataloaderIterator:
 class IterBasedTrainLoop(BaseLoop):
     """Loop for iter-based training.
 
+    Note:
+        The whole training process is treated as a big epoch, and the
+        dataloader will be restarted once it is exhausted. If the dataloader
+        is built from a dict with ``num_workers > 0``, ``persistent_workers``
+        defaults to True to avoid re-creating workers at the restart.
+
     Args:
         runner (Runner): A reference of runner.
         dataloader (Dataloader or dict): A dataloader object or a dict to
@@ -206,16 +427,47 @@ class IterBasedTrainLoop(BaseLoop):
             first element in the tuple is a milestone and the second
             element is a interval. The interval is used after the
             corresponding milestone. Defaults to None.
+        prefetch (bool): Whether to copy the next batch to GPU on a side
+            CUDA stream while the current batch is being computed. It is
+            recommended to enable ``pin_memory`` of the dataloader at the
+            same time. Defaults to False.
+        memory_format (str or torch.memory_format, optional): The memory
+            format which 4-D tensors of batches are converted to once they
+            are prefetched, e.g., ``'channels_last'``. It only takes effect
+            when ``prefetch`` is True. The model should be converted to the
+            same memory format as well. Defaults to None.
+        capture_cuda_graph (bool): Whether to capture ``train_step`` of the
+            model into a CUDA graph and replay it in the following
+            iterations, which removes the overhead of Python and kernel
+            launches. Defaults to False.
+
+    Warning:
+        ``capture_cuda_graph`` is experimental. It requires that all batches
+        have the same structure and tensor shapes, and that no CPU-GPU
+        synchronization happens in ``train_step``. Distributed training and
+        model wrappers, gradient accumulation, mixed precision training with
+        ``AmpOptimWrapper``, multiple optimizers and gradient clipping are
+        not supported. Optimizers which have the ``capturable`` argument,
+        e.g., ``Adam`` and ``AdamW``, should be built with
+        ``capturable=True``. Learning rates stored as Python numbers are
+        frozen into the graph, so parameter schedulers do not take effect
+        after capturing, and a warning is logged if any is configured. The
+        dataloader should drop the last incomplete batch, otherwise an error
+        is raised when it is met. Non-tensor data, such as the metainfo of
+        data samples, is taken from the captured batch.
     """
 
-    def __init__(
-            self,
-            runner,
-            dataloader: Union[DataLoader, Dict],
-            max_iters: int,
-            val_begin: int = 1,
-            val_interval: int = 1000,
-            dynamic_intervals: Optional[List[Tuple[int, int]]] = None) -> None:
+    def __init__(self,
+                 runner,
+                 dataloader: Union[DataLoader, Dict],
+                 max_iters: int,
+                 val_begin: int = 1,
+                 val_interval: int = 1000,
+                 dynamic_intervals: Optional[List[Tuple[int, int]]] = None,
+                 prefetch: bool = False,
+                 memory_format: Optional[Union[str,
+                                               torch.memory_format]] = None,
+                 capture_cuda_graph: bool = False) -> None:
         super().__init__(runner, dataloader)
         self._max_iters = int(max_iters)
         assert self._max_iters == max_iters, \
@@ -228,6 +480,9 @@ class IterBasedTrainLoop(BaseLoop):
         # This attribute will be updated by `EarlyStoppingHook`
         # when it is enabled.
         self.stop_training = False
+        # Hooks called in each iteration.
+        self._call_before_iter = runner._make_hook_caller('before_train_iter')
+        self._call_after_iter = runner._make_hook_caller('after_train_iter')
         if hasattr(self.dataloader.dataset, 'metainfo'):
             self.runner.visualizer.dataset_meta = \
                 self.dataloader.dataset.metainfo
@@ -239,12 +494,30 @@ class IterBasedTrainLoop(BaseLoop):
                 logger='current',
                 level=logging.WARNING)
         # get the iterator of the dataloader
-        self.dataloader_iterator = _InfiniteDataloaderIterator(self.dataloader)
+        self.dataloader_iterator: Iterator[Any] = _InfiniteDataloaderIterator(
+            self.dataloader)
+        if prefetch:
+            self.dataloader_iterator = CUDAPrefetcher(
+                self.dataloader_iterator, memory_format=memory_format)
 
         self.dynamic_milestones, self.dynamic_intervals = \
             calc_dynamic_intervals(
                 self.val_interval, dynamic_intervals)
 
+        if capture_cuda_graph and not is_cuda_available():
+            print_log(
+                '`capture_cuda_graph` is only available when CUDA is '
+                'available, it will be disabled.',
+                logger='current',
+                level=logging.WARNING)
+            capture_cuda_graph = False
+        self.capture_cuda_graph = capture_cuda_graph
+        self._graph: Optional[torch.cuda.CUDAGraph] = None
+        self._graph_warmup_iters = 3
+        self._graph_checked = False
+        self._static_batch: Any = None
+        self._static_outputs: Optional[Dict[str, torch.Tensor]] = None
+
     @property
     def max_epochs(self):
         """int: Total epochs to train model."""
@@ -271,17 +544,34 @@ class IterBasedTrainLoop(BaseLoop):
         # In iteration-based training loop, we treat the whole training process
         # as a big epoch and execute the corresponding hook.
         self.runner.call_hook('before_train_epoch')
-        while self._iter < self._max_iters and not self.stop_training:
-            self.runner.model.train()
-
+        val_loop = self.runner.val_loop
+        # Count down the iterations until the next multiple of
+        # `val_interval` instead of computing the modulo every iteration.
+        val_interval = self.val_interval
+        val_countdown = val_interval - self._iter % val_interval
+        # `model.train()` traverses all submodules, so it is only called
+        # before training and after each validation instead of every
+        # iteration.
+        self.runner.model.train()
+        # Track the iteration with a local variable rather than reading
+        # `self._iter` repeatedly. It is synchronized after each `run_iter`
+        # since subclasses may override `run_iter` to update `self._iter`.
+        idx = self._iter
+        while idx < self._max_iters and not self.stop_training:
             data_batch = next(self.dataloader_iterator)
             self.run_iter(data_batch)
+            idx = self._iter
 
             self._decide_current_val_interval()
-            if (self.runner.val_loop is not None
-                    and self._iter >= self.val_begin
-                    and self._iter % self.val_interval == 0):
-                self.runner.val_loop.run()
+            val_countdown -= 1
+            if self.val_interval != val_interval:
+                val_interval = self.val_interval
+                val_countdown = -idx % val_interval
+            if val_countdown == 0:
+                val_countdown = val_interval
+                if val_loop is not None and idx >= self.val_begin:
+                    val_loop.run()
+                    self.runner.model.train()
 
         self.runner.call_hook('after_train_epoch')
         self.runner.call_hook('after_train')
@@ -293,26 +583,118 @@ class IterBasedTrainLoop(BaseLoop):
         Args:
             data_batch (Sequence[dict]): Batch of data from dataloader.
         """
-        self.runner.call_hook(
-            'before_train_iter', batch_idx=self._iter, data_batch=data_batch)
+        idx = self._iter
+        runner = self.runner
+        self._call_before_iter(batch_idx=idx, data_batch=data_batch)
         # Enable gradient accumulation mode and avoid unnecessary gradient
         # synchronization during gradient accumulation process.
         # outputs should be a dict of loss.
-        outputs = self.runner.model.train_step(
-            data_batch, optim_wrapper=self.runner.optim_wrapper)
-
-        self.runner.call_hook(
-            'after_train_iter',
-            batch_idx=self._iter,
-            data_batch=data_batch,
-            outputs=outputs)
-        self._iter += 1
+        if self.capture_cuda_graph:
+            outputs = self._graph_train_step(data_batch)
+        else:
+            outputs = runner.model.train_step(
+                data_batch, optim_wrapper=runner.optim_wrapper)
+
+        self._call_after_iter(
+            batch_idx=idx, data_batch=data_batch, outputs=outputs)
+        # Hooks read the current iteration through `runner.iter`, so it is
+        # still updated in each iteration.
+        self._iter = idx + 1
 
     def _decide_current_val_interval(self) -> None:
         """Dynamically modify the ``val_interval``."""
         step = bisect.bisect(self.dynamic_milestones, (self._iter + 1))
         self.val_interval = self.dynamic_intervals[step - 1]
 
+    def _graph_train_step(self, data_batch: Sequence[dict]) -> dict:
+        """Run ``train_step`` of the model with a CUDA graph.
+
+        The first few iterations run eagerly on a side stream to warm up
+        the model and optimizer. Then ``train_step`` is captured with static
+        input tensors, and each following iteration copies ``data_batch``
+        into the static tensors and replays the graph.
+
+        Args:
+            data_batch (Sequence[dict]): Batch of data from dataloader.
+
+        Returns:
+            dict: A dict of loss tensor for logging.
+        """
+        model = self.runner.model
+        optim_wrapper = self.runner.optim_wrapper
+        if self._graph is not None:
+            try:
+                _copy_data(self._static_batch, data_batch)
+            except ValueError as e:
+                raise ValueError(
+                    'The batch does not match the batch captured in the CUDA '
+                    f'graph: {e}. `capture_cuda_graph` requires all batches '
+                    'to have the same structure and tensor shapes, e.g., '
+                    'set `drop_last=True` for the dataloader.') from None
+            self._graph.replay()
+            # Python side states of `optim_wrapper` are not recorded in the
+            # graph.
+            optim_wrapper._inner_count += 1
+            # Outputs will be overwritten by the next replay.
+            return {
+                key: value.clone()
+                for key, value in self._static_outputs.items()  # type: ignore
+            }
+
+        if not self._graph_checked:
+            self._check_graph_capture()
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        if self._graph_warmup_iters > 0:
+            self._graph_warmup_iters -= 1
+            with torch.cuda.stream(stream):
+                outputs = model.train_step(
+                    data_batch, optim_wrapper=optim_wrapper)
+            torch.cuda.current_stream().wait_stream(stream)
+            return outputs
+
+        device = torch.device('cuda', torch.cuda.current_device())
+        self._static_batch = _to_device(data_batch, device)
+        self._graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._graph, stream=stream):
+            self._static_outputs = model.train_step(
+                self._static_batch, optim_wrapper=optim_wrapper)
+        # Capturing does not actually run the kernels.
+        optim_wrapper._inner_count -= 1
+        return self._graph_train_step(data_batch)
+
+    def _check_graph_capture(self) -> None:
+        """Check whether the training configuration can be captured into a
+        CUDA graph."""
+        model = self.runner.model
+        assert not is_model_wrapper(model), (
+            '`capture_cuda_graph` does not support distributed training or '
+            f'model wrappers, but got {type(model).__name__}')
+        optim_wrapper = self.runner.optim_wrapper
+        assert type(optim_wrapper) is OptimWrapper and \
+            optim_wrapper._accumulative_counts == 1, (
+                '`capture_cuda_graph` only supports `OptimWrapper` without '
+                f'gradient accumulation, but got {optim_wrapper}')
+        assert not optim_wrapper.clip_grad_kwargs, (
+            '`capture_cuda_graph` does not support gradient clipping, but '
+            f'got clip_grad={optim_wrapper.clip_grad_kwargs}')
+        # Optimizers such as `Adam` only support CUDA graphs when they are
+        # built with `capturable=True`.
+        optimizer = optim_wrapper.optimizer
+        assert all(
+            group.get('capturable', True)
+            for group in optimizer.param_groups), (
+                f'`capture_cuda_graph` requires `{type(optimizer).__name__}` '
+                'to be built with `capturable=True`')
+        if self.runner.param_schedulers:
+            print_log(
+                'Parameter schedulers do not take effect after `train_step` '
+                'is captured into a CUDA graph, since the learning rate and '
+                'momentum are frozen in the graph.',
+                logger='current',
+                level=logging.WARNING)
+        self._graph_checked = True
+
 
 @LOOPS.register_module()
 class ValLoop(BaseLoop):
@@ -325,14 +707,41 @@ class ValLoop(BaseLoop):
         evaluator (Evaluator or dict or list): Used for computing metrics.
         fp16 (bool): Whether to enable fp16 validation. Defaults to
             False.
+        prefetch (bool): Whether to copy the next batch to GPU on a side
+            CUDA stream while the current batch is being computed. It is
+            recommended to enable ``pin_memory`` of the dataloader at the
+            same time. Defaults to False.
+        memory_format (str or torch.memory_format, optional): The memory
+            format which 4-D tensors of batches are converted to once they
+            are prefetched, e.g., ``'channels_last'``. It only takes effect
+            when ``prefetch`` is True. The model should be converted to the
+            same memory format as well. Defaults to None.
+        async_process (bool): Whether to call ``evaluator.process`` in a
+            background thread, so that it overlaps with the forward of the
+            next batch. The metrics and the hooks should not modify the
+            outputs of the model in place when it is enabled. Defaults to
+            False.
+        inference_mode (bool): Whether to run iterations under
+            ``torch.inference_mode`` instead of ``torch.no_grad``, which
+            reduces the CPU overhead of each operator. Tensors created under
+            inference mode cannot be saved for backward or modified in place
+            outside of it, so it should not be enabled if the model caches
+            tensors created in validation, e.g., lazily built buffers or
+            anchors, and uses them in training, or if the metrics or the hooks
+            modify the outputs in place. Defaults to False.
     """
 
     def __init__(self,
                  runner,
                  dataloader: Union[DataLoader, Dict],
                  evaluator: Union[Evaluator, Dict, List],
-                 fp16: bool = False) -> None:
-        super().__init__(runner, dataloader)
+                 fp16: bool = False,
+                 prefetch: bool = False,
+                 memory_format: Optional[Union[str,
+                                               torch.memory_format]] = None,
+                 async_process: bool = False,
+                 inference_mode: bool = False) -> None:
+        super().__init__(runner, dataloader, prefetch, memory_format)
 
         if isinstance(evaluator, (dict, list)):
             self.evaluator = runner.build_evaluator(evaluator)  # type: ignore
@@ -353,22 +762,33 @@ class ValLoop(BaseLoop):
                 logger='current',
                 level=logging.WARNING)
         self.fp16 = fp16
+        self.inference_mode = inference_mode
+        self._processor = _EvaluatorProcessor(async_process, inference_mode)
+        # Hooks called in each iteration.
+        self._call_before_iter = runner._make_hook_caller('before_val_iter')
+        self._call_after_iter = runner._make_hook_caller('after_val_iter')
 
     def run(self) -> dict:
         """Launch validation."""
         self.runner.call_hook('before_val')
         self.runner.call_hook('before_val_epoch')
         self.runner.model.eval()
-        for idx, data_batch in enumerate(self.dataloader):
-            self.run_iter(idx, data_batch)
+        # Only datasets without `__len__` are sized by counting samples.
+        count_samples = not hasattr(self.dataloader.dataset, '__len__')
+        num_samples = 0
+        with self._processor:
+            for idx, data_batch in self._iterate():
+                self.run_iter(idx, data_batch)
+                if count_samples:
+                    num_samples += _get_num_samples(data_batch)
 
         # compute metrics
-        metrics = self.evaluator.evaluate(len(self.dataloader.dataset))
+        metrics = self.evaluator.evaluate(
+            _get_dataset_size(self.dataloader.dataset, num_samples))
         self.runner.call_hook('after_val_epoch', metrics=metrics)
         self.runner.call_hook('after_val')
         return metrics
 
-    @torch.no_grad()
     def run_iter(self, idx, data_batch: Sequence[dict]):
         """Iterate one mini-batch.
 
@@ -376,17 +796,14 @@ class ValLoop(BaseLoop):
             data_batch (Sequence[dict]): Batch of data
                 from dataloader.
         """
-        self.runner.call_hook(
-            'before_val_iter', batch_idx=idx, data_batch=data_batch)
-        # outputs should be sequence of BaseDataElement
-        with autocast(enabled=self.fp16):
-            outputs = self.runner.model.val_step(data_batch)
-        self.evaluator.process(data_samples=outputs, data_batch=data_batch)
-        self.runner.call_hook(
-            'after_val_iter',
-            batch_idx=idx,
-            data_batch=data_batch,
-            outputs=outputs)
+        with _no_grad(self.inference_mode):
+            self._call_before_iter(batch_idx=idx, data_batch=data_batch)
+            # outputs should be sequence of BaseDataElement
+            with autocast(enabled=self.fp16):
+                outputs = self.runner.model.val_step(data_batch)
+            self._processor.process(self.evaluator, outputs, data_batch)
+            self._call_after_iter(
+                batch_idx=idx, data_batch=data_batch, outputs=outputs)
 
 
 @LOOPS.register_module()
@@ -400,18 +817,46 @@ class TestLoop(BaseLoop):
         evaluator (Evaluator or dict or list): Used for computing metrics.
         fp16 (bool): Whether to enable fp16 testing. Defaults to
             False.
+        prefetch (bool): Whether to copy the next batch to GPU on a side
+            CUDA stream while the current batch is being computed. It is
+            recommended to enable ``pin_memory`` of the dataloader at the
+            same time. Defaults to False.
+        memory_format (str or torch.memory_format, optional): The memory
+            format which 4-D tensors of batches are converted to once they
+            are prefetched, e.g., ``'channels_last'``. It only takes effect
+            when ``prefetch`` is True. The model should be converted to the
+            same memory format as well. Defaults to None.
+        async_process (bool): Whether to call ``evaluator.process`` in a
+            background thread, so that it overlaps with the forward of the
+            next batch. The metrics and the hooks should not modify the
+            outputs of the model in place when it is enabled. Defaults to
+            False.
+        inference_mode (bool): Whether to run iterations under
+            ``torch.inference_mode`` instead of ``torch.no_grad``, which
+            reduces the CPU overhead of each operator. Tensors created under
+            inference mode cannot be modified in place outside of it, so it
+            should be disabled if the metrics or the hooks modify the outputs
+            in place. Defaults to True.
     """
 
     def __init__(self,
                  runner,
                  dataloader: Union[DataLoader, Dict],
                  evaluator: Union[Evaluator, Dict, List],
-                 fp16: bool = False):
-        super().__init__(runner, dataloader)
+                 fp16: bool = False,
+                 prefetch: bool = False,
+                 memory_format: Optional[Union[str,
+                                               torch.memory_format]] = None,
+                 async_process: bool = False,
+                 inference_mode: bool = True):
+        super().__init__(runner, dataloader, prefetch, memory_format)
 
-        if isinstance(evaluator, dict) or isinstance(evaluator, list):
+        if isinstance(evaluator, (dict, list)):
             self.evaluator = runner.build_evaluator(evaluator)  # type: ignore
         else:
+            assert isinstance(evaluator, Evaluator), (
+                'evaluator must be one of dict, list or Evaluator instance, '
+                f'but got {type(evaluator)}.')
             self.evaluator = evaluator  # type: ignore
         if hasattr(self.dataloader.dataset, 'metainfo'):
             self.evaluator.dataset_meta = self.dataloader.dataset.metainfo
@@ -425,36 +870,44 @@ class TestLoop(BaseLoop):
                 logger='current',
                 level=logging.WARNING)
         self.fp16 = fp16
+        self.inference_mode = inference_mode
+        self._processor = _EvaluatorProcessor(async_process, inference_mode)
+        # Hooks called in each iteration.
+        self._call_before_iter = runner._make_hook_caller('before_test_iter')
+        self._call_after_iter = runner._make_hook_caller('after_test_iter')
 
     def run(self) -> dict:
         """Launch test."""
         self.runner.call_hook('before_test')
         self.runner.call_hook('before_test_epoch')
         self.runner.model.eval()
-        for idx, data_batch in enumerate(self.dataloader):
-            self.run_iter(idx, data_batch)
+        # Only datasets without `__len__` are sized by counting samples.
+        count_samples = not hasattr(self.dataloader.dataset, '__len__')
+        num_samples = 0
+        with self._processor:
+            for idx, data_batch in self._iterate():
+                self.run_iter(idx, data_batch)
+                if count_samples:
+                    num_samples += _get_num_samples(data_batch)
 
         # compute metrics
-        metrics = self.evaluator.evaluate(len(self.dataloader.dataset))
+        metrics = self.evaluator.evaluate(
+            _get_dataset_size(self.dataloader.dataset, num_samples))
         self.runner.call_hook('after_test_epoch', metrics=metrics)
         self.runner.call_hook('after_test')
         return metrics
 
-    @torch.no_grad()
     def run_iter(self, idx, data_batch: Sequence[dict]) -> None:
         """Iterate one mini-batch.
 
         Args:
             data_batch (Sequence[dict]): Batch of data from dataloader.
         """
-        self.runner.call_hook(
-            'before_test_iter', batch_idx=idx, data_batch=data_batch)
-        # predictions should be sequence of BaseDataElement
-        with autocast(enabled=self.fp16):
-            outputs = self.runner.model.test_step(data_batch)
-        self.evaluator.process(data_samples=outputs, data_batch=data_batch)
-        self.runner.call_hook(
-            'after_test_iter',
-            batch_idx=idx,
-            data_batch=data_batch,
-            outputs=outputs)
+        with _no_grad(self.inference_mode):
+            self._call_before_iter(batch_idx=idx, data_batch=data_batch)
+            # predictions should be sequence of BaseDataElement
+            with autocast(enabled=self.fp16):
+                outputs = self.runner.model.test_step(data_batch)
+            self._processor.process(self.evaluator, outputs, data_batch)
+            self._call_after_iter(
+                batch_idx=idx, data_batch=data_batch, outputs=outputs)
@@ -0,0 +1,216 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import torch
+
+from mmengine.device import is_cuda_available
+from mmengine.structures import BaseDataElement
+
+_EXHAUSTED = object()
+# CPU tensors no larger than this are coalesced before being copied.
+_MAX_COALESCE_BYTES = 1 << 20
+
+
+def _collect_tensors(data: Any, tensors: List[torch.Tensor]) -> None:
+    """Recursively collect tensors in ``data`` into ``tensors``."""
+    if isinstance(data, Mapping):
+        for value in data.values():
+            _collect_tensors(value, tensors)
+    elif isinstance(data, BaseDataElement):
+        for value in data.values():
+            _collect_tensors(value, tensors)
+    elif isinstance(data, Sequence) and not isinstance(data, (str, bytes)):
+        for value in data:
+            _collect_tensors(value, tensors)
+    elif isinstance(data, torch.Tensor):
+        tensors.append(data)
+
+
+def _replace_tensors(data: Any, tensors: Iterator[torch.Tensor]) -> Any:
+    """Recursively replace tensors in ``data`` with ``tensors`` in the order
+    of :func:`_collect_tensors`."""
+    if isinstance(data, Mapping):
+        return {key: _replace_tensors(data[key], tensors) for key in data}
+    elif isinstance(data, (str, bytes)) or data is None:
+        return data
+    elif isinstance(data, tuple) and hasattr(data, '_fields'):
+        # namedtuple
+        return type(data)(*(_replace_tensors(sample, tensors) for sample in data))  # type: ignore  # noqa: E501  # yapf:disable
+    elif isinstance(data, Sequence):
+        return type(data)(_replace_tensors(sample, tensors) for sample in data)  # type: ignore  # noqa: E501  # yapf:disable
+    elif isinstance(data, BaseDataElement):
+        new_data = data.new()
+        for key, value in data.items():
+            new_data.set_data({key: _replace_tensors(value, tensors)})
+        return new_data
+    elif isinstance(data, torch.Tensor):
+        return next(tensors)
+    else:
+        return data
+
+
+def _to_memory_format(tensor: torch.Tensor,
+                      memory_format: torch.memory_format) -> torch.Tensor:
+    """Convert ``tensor`` to ``memory_format`` if it has the matched number
+    of dimensions, i.e., 4 for ``torch.channels_last`` and 5 for
+    ``torch.channels_last_3d``."""
+    if memory_format is torch.channels_last and tensor.dim() != 4:
+        return tensor
+    if memory_format is torch.channels_last_3d and tensor.dim() != 5:
+        return tensor
+    return tensor.contiguous(memory_format=memory_format)
+
+
+def _to_device(data: Any,
+               device: torch.device,
+               memory_format: Optional[torch.memory_format] = None) -> Any:
+    """Recursively copy tensors in ``data`` to ``device`` without blocking the
+    host.
+
+    Small CPU tensors which are not page-locked and have the same dtype are
+    concatenated into a page-locked buffer and copied in a single transfer,
+    rather than issuing many small copies one tensor at a time. Page-locked
+    tensors, e.g., pinned by the dataloader, and large tensors are copied
+    directly, since concatenating them is a synchronous host copy which costs
+    more than it saves. Tensors on ``device`` are returned as they are.
+
+    If ``memory_format`` is given, the copied tensors are also converted to
+    it on ``device``.
+    """
+    tensors: List[torch.Tensor] = []
+    _collect_tensors(data, tensors)
+    moved = list(tensors)
+    groups: Dict[torch.dtype, List[int]] = defaultdict(list)
+    for i, tensor in enumerate(tensors):
+        if (tensor.device.type == 'cpu' and not tensor.is_pinned() and
+                tensor.numel() * tensor.element_size() <= _MAX_COALESCE_BYTES):
+            groups[tensor.dtype].append(i)
+        else:
+            moved[i] = tensor.to(device, non_blocking=True)
+
+    for dtype, indices in groups.items():
+        if len(indices) == 1:
+            moved[indices[0]] = tensors[indices[0]].to(
+                device, non_blocking=True)
+            continue
+        numels = [tensors[i].numel() for i in indices]
+        staging = torch.empty(sum(numels), dtype=dtype, pin_memory=True)
+        torch.cat([tensors[i].reshape(-1) for i in indices], out=staging)
+        flat = staging.to(device, non_blocking=True)
+        for i, chunk in zip(indices, flat.split(numels)):
+            moved[i] = chunk.view(tensors[i].shape)
+    if memory_format is not None:
+        moved = [_to_memory_format(tensor, memory_format) for tensor in moved]
+    return _replace_tensors(data, iter(moved))
+
+
+def _record_stream(data: Any, stream: torch.cuda.Stream) -> None:
+    """Mark all CUDA tensors in ``data`` as being used by ``stream``, so that
+    the caching allocator will not reuse their memory too early."""
+    tensors: List[torch.Tensor] = []
+    _collect_tensors(data, tensors)
+    for tensor in tensors:
+        if tensor.is_cuda:
+            tensor.record_stream(stream)
+
+
+class CUDAPrefetcher:
+    """Iterate over a dataloader while copying the next batch to GPU in
+    advance.
+
+    When a batch is fetched, the host-to-device copy of the following batch
+    is issued on a side CUDA stream, so that it overlaps with the forward and
+    backward computation of the current batch. If CUDA is not available,
+    batches are returned as they are.
+
+    Note:
+        Asynchronous copies only take effect for tensors in page-locked
+        memory. It is recommended to set ``pin_memory=True`` for the
+        dataloader.
+
+    Args:
+        loader (Iterable): A dataloader or an iterator yielding batches.
+        device (torch.device, optional): The target device. Defaults to
+            None, which means the current CUDA device.
+        memory_format (str or torch.memory_format, optional): If given,
+            4-D tensors (5-D tensors for ``channels_last_3d``) of batches are
+            converted to this memory format once they are copied, e.g.,
+            ``'channels_last'``, so that the layout is not converted in each
+            forward of a model in the same memory format. Defaults to None.
+
+    Examples:
+        >>> prefetcher = CUDAPrefetcher(dataloader)
+        >>> for data_batch in prefetcher:
+        >>>     # tensors in `data_batch` are already on the GPU
+        >>>     outputs = model.train_step(data_batch, optim_wrapper)
+    """
+
+    def __init__(
+        self,
+        loader: Iterable,
+        device: Optional[torch.device] = None,
+        memory_format: Optional[Union[str,
+                                      torch.memory_format]] = None) -> None:
+        self._loader = loader
+        self._device = device
+        if isinstance(memory_format, str):
+            memory_format = getattr(torch, memory_format, memory_format)
+        if memory_format is not None:
+            assert isinstance(memory_format, torch.memory_format), (
+                f'Invalid memory format {memory_format}.')
+        self._memory_format = memory_format
+        self._enabled = is_cuda_available()
+        self._stream: Optional[torch.cuda.Stream] = None
+        self._iterator: Optional[Iterator] = None
+        self.next_batch: Any = _EXHAUSTED
+
+    def __len__(self) -> int:
+        return len(self._loader)  # type: ignore
+
+    def __iter__(self) -> 'CUDAPrefetcher':
+        if self._enabled and self._stream is None:
+            # Resolve the device lazily since the current CUDA device may be
+            # set after the prefetcher is built.
+            if self._device is None:
+                self._device = torch.device('cuda',
+                                            torch.cuda.current_device())
+            self._stream = torch.cuda.Stream(device=self._device)
+        self._iterator = iter(self._loader)
+        self.preload()
+        return self
+
+    def preload(self) -> None:
+        """Fetch the next batch and issue its copy on the side stream."""
+        assert self._iterator is not None, (
+            'The prefetcher should be iterated before preloading batches.')
+        try:
+            batch = next(self._iterator)
+        except StopIteration:
+            self.next_batch = _EXHAUSTED
+            return
+        if self._enabled:
+            with torch.cuda.stream(self._stream):
+                batch = _to_device(  # type: ignore
+                    batch, self._device, self._memory_format)
+        elif self._memory_format is not None:
+            tensors: List[torch.Tensor] = []
+            _collect_tensors(batch, tensors)
+            batch = _replace_tensors(
+                batch, (_to_memory_format(tensor, self._memory_format)
+                        for tensor in tensors))
+        self.next_batch = batch
+
+    def __next__(self) -> Any:
+        if self._iterator is None:
+            iter(self)
+        batch = self.next_batch
+        if batch is _EXHAUSTED:
+            raise StopIteration
+        if self._enabled:
+            current_stream = torch.cuda.current_stream(self._device)
+            current_stream.wait_stream(self._stream)  # type: ignore
+            _record_stream(batch, current_stream)
+        self.preload()
+        return batch
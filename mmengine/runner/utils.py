@@ -1,13 +1,14 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import logging
 import random
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
 import torch
 from torch.utils.data import DataLoader
 
 from mmengine.dist import get_rank, sync_random_seed
+from mmengine.hooks import Hook
 from mmengine.logging import print_log
 from mmengine.utils import digit_version, is_list_of
 from mmengine.utils.dl_utils import TORCH_VERSION
@@ -102,3 +103,30 @@ def _get_batch_size(dataloader: dict):
     else:
         raise ValueError('dataloader should be a dict or a Dataloader '
                          f'instance, but got {type(dataloader)}')
+
+
+def _get_triggered_hooks(hooks: Sequence[Hook], fn_name: str) -> List[Hook]:
+    """Get hooks which will act when ``fn_name`` is called.
+
+    Methods of :class:`Hook` do nothing by default, so hooks which do not
+    override the method corresponding to ``fn_name`` are filtered out.
+
+    Args:
+        hooks (Sequence[Hook]): Registered hooks.
+        fn_name (str): The function name in each hook, such as
+            "before_train_iter".
+
+    Returns:
+        List[Hook]: Hooks triggered by ``fn_name``.
+    """
+    triggered_hooks = []
+    for hook in hooks:
+        if fn_name in Hook.stages:
+            # Methods may also be overridden by assigning to the instance.
+            if (fn_name in hook.get_triggered_stages()
+                    or fn_name in vars(hook)):
+                triggered_hooks.append(hook)
+        # support adding additional custom hook methods
+        elif hasattr(hook, fn_name):
+            triggered_hooks.append(hook)
+    return triggered_hooks
@@ -510,6 +510,17 @@ class BaseDataElement:
                 new_data.set_data(data)
         return new_data
 
+    # Tensor-like methods
+    def pin_memory(self) -> 'BaseDataElement':
+        """Copy all tensors in data to page-locked memory."""
+        new_data = self.new()
+        for k, v in self.items():
+            if isinstance(v, (torch.Tensor, BaseDataElement)):
+                v = v.pin_memory()
+                data = {k: v}
+                new_data.set_data(data)
+        return new_data
+
     # Tensor-like methods
     def npu(self) -> 'BaseDataElement':
         """Convert all tensors to NPU in data."""
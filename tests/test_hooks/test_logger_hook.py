@@ -97,6 +97,16 @@ class TestLoggerHook(RunnerTestCase):
         logger_hook.after_train_iter(runner, batch_idx=4)
         runner.log_processor.get_log_after_iter.assert_called()
 
+        # Test end of the epoch with the length cached by the train loop.
+        runner = MagicMock()
+        runner.log_processor.get_log_after_iter = MagicMock(
+            return_value=(dict(), 'log_str'))
+        runner.train_loop.iters_per_epoch = 5
+        logger_hook = LoggerHook(ignore_last=False)
+        logger_hook.after_train_iter(runner, batch_idx=4)
+        runner.log_processor.get_log_after_iter.assert_called()
+        runner.train_dataloader.__len__.assert_not_called()
+
         # Test print exp_name
         runner = MagicMock()
         runner.log_processor.get_log_after_iter = MagicMock(
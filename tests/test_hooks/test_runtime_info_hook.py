@@ -113,6 +113,22 @@ class TestRuntimeInfoHook(RunnerTestCase):
         self.assertEqual(
             runner.message_hub.get_scalar('train/loss_cls').current(), 1.111)
 
+        # tensors are converted to python numbers
+        outputs = dict(
+            loss=torch.tensor(1.5, requires_grad=True),
+            loss_bbox=torch.tensor([0.5]),
+            acc=torch.tensor(3),
+            loss_cls=dict(value=torch.tensor(2.), count=2))
+        hook.after_train_iter(
+            runner, batch_idx=2, data_batch=None, outputs=outputs)
+        message_hub = runner.message_hub
+        self.assertEqual(message_hub.get_scalar('train/loss').current(), 1.5)
+        self.assertEqual(
+            message_hub.get_scalar('train/loss_bbox').current(), 0.5)
+        self.assertEqual(message_hub.get_scalar('train/acc').current(), 3)
+        self.assertEqual(
+            message_hub.get_scalar('train/loss_cls').current(), 2.)
+
     def test_before_and_after_val(self):
         cfg = copy.deepcopy(self.epoch_based_cfg)
         runner = self.build_runner(cfg)
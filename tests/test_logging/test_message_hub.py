@@ -114,6 +114,12 @@ class TestMessageHub:
         assert loss_bbox.current() == 3
         assert loss_iou.mean() == 0.5
 
+        # test update scalars with prefix
+        message_hub.update_scalars(log_dict, prefix='train/')
+        assert message_hub.get_scalar('train/loss').current() == 1
+        assert message_hub.get_scalar('train/loss_cls').current() == 2
+        assert message_hub.get_scalar('train/loss_iou').mean() == 0.5
+
         with pytest.raises(AssertionError):
             loss_dict = dict(error_type=[])
             message_hub.update_scalars(loss_dict)
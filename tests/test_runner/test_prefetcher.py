@@ -0,0 +1,91 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase, skipIf
+
+import torch
+
+from mmengine.device import is_cuda_available
+from mmengine.runner import CUDAPrefetcher
+from mmengine.structures import BaseDataElement
+
+
+def _is_adjacent(tensor1, tensor2):
+    """Whether ``tensor2`` follows ``tensor1`` in the same buffer."""
+    return tensor2.data_ptr() == (
+        tensor1.data_ptr() + tensor1.numel() * tensor1.element_size())
+
+
+class TestCUDAPrefetcher(TestCase):
+
+    def setUp(self):
+        self.loader = [
+            dict(
+                inputs=torch.full((2, 3), i),
+                data_samples=[BaseDataElement(gt=torch.tensor(i))])
+            for i in range(3)
+        ]
+
+    def test_iter(self):
+        prefetcher = CUDAPrefetcher(self.loader)
+        self.assertEqual(len(prefetcher), 3)
+        # Iterate twice to make sure the prefetcher can be restarted.
+        for _ in range(2):
+            batches = list(prefetcher)
+            self.assertEqual(len(batches), 3)
+            for i, batch in enumerate(batches):
+                self.assertTrue(
+                    torch.equal(batch['inputs'].cpu(), torch.full((2, 3), i)))
+                self.assertEqual(batch['data_samples'][0].gt.item(), i)
+
+        # Convert tensors to `memory_format`
+        loader = [dict(inputs=torch.rand(2, 3, 4, 5), gt=torch.rand(2, 3))]
+        prefetcher = CUDAPrefetcher(loader, memory_format='channels_last')
+        batch = next(prefetcher)
+        self.assertTrue(
+            batch['inputs'].is_contiguous(memory_format=torch.channels_last))
+        self.assertTrue(
+            torch.equal(batch['inputs'].cpu(), loader[0]['inputs']))
+        self.assertTrue(torch.equal(batch['gt'].cpu(), loader[0]['gt']))
+        with self.assertRaisesRegex(AssertionError, 'Invalid memory format'):
+            CUDAPrefetcher(loader, memory_format='channel_last')
+
+        # Support calling `next` without calling `iter` explicitly.
+        prefetcher = CUDAPrefetcher(iter(self.loader))
+        self.assertEqual(next(prefetcher)['data_samples'][0].gt.item(), 0)
+        self.assertEqual(next(prefetcher)['data_samples'][0].gt.item(), 1)
+        self.assertEqual(next(prefetcher)['data_samples'][0].gt.item(), 2)
+        with self.assertRaises(StopIteration):
+            next(prefetcher)
+
+    @skipIf(not is_cuda_available(), reason='requires CUDA support')
+    def test_iter_cuda(self):
+        prefetcher = CUDAPrefetcher(self.loader)
+        for i, batch in enumerate(prefetcher):
+            self.assertTrue(batch['inputs'].is_cuda)
+            self.assertTrue(batch['data_samples'][0].gt.is_cuda)
+            # small tensors with the same dtype are copied together
+            self.assertTrue(
+                _is_adjacent(batch['inputs'], batch['data_samples'][0].gt))
+            self.assertTrue(
+                torch.equal(batch['inputs'].cpu(), torch.full((2, 3), i)))
+            self.assertEqual(batch['data_samples'][0].gt.item(), i)
+
+        # pinned and large tensors are copied directly
+        loader = [
+            dict(
+                pinned=torch.rand(2, 3).pin_memory(),
+                small1=torch.rand(2, 3),
+                small2=torch.rand(2, 3),
+                large=torch.rand(1 << 20))
+        ]
+        batch = next(CUDAPrefetcher(loader))
+        self.assertTrue(_is_adjacent(batch['small1'], batch['small2']))
+        self.assertFalse(_is_adjacent(batch['pinned'], batch['small1']))
+        self.assertFalse(_is_adjacent(batch['small2'], batch['large']))
+        for key, value in batch.items():
+            self.assertTrue(value.is_cuda)
+            self.assertTrue(torch.equal(value.cpu(), loader[0][key]))
+
+        # tensors already on GPU are kept
+        inputs = torch.rand(2, 3).cuda()
+        prefetcher = CUDAPrefetcher([dict(inputs=inputs)])
+        self.assertIs(next(prefetcher)['inputs'], inputs)
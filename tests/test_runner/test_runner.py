@@ -6,18 +6,21 @@ import os.path as osp
 import random
 import shutil
 import tempfile
+import threading
 from functools import partial
 from unittest import TestCase, skipIf
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 import torch
 import torch.nn as nn
 from torch.nn.parallel import DistributedDataParallel
 from torch.optim import SGD, Adam
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import DataLoader, Dataset, IterableDataset
 
 from mmengine.config import Config
 from mmengine.dataset import DefaultSampler, pseudo_collate
+from mmengine.device import is_cuda_available
 from mmengine.evaluator import BaseMetric, Evaluator
 from mmengine.hooks import (CheckpointHook, DistSamplerSeedHook, Hook,
                             IterTimerHook, LoggerHook, ParamSchedulerHook,
@@ -33,8 +36,10 @@ from mmengine.registry import (DATASETS, EVALUATOR, FUNCTIONS, HOOKS,
                                Registry)
 from mmengine.runner import (BaseLoop, EpochBasedTrainLoop, IterBasedTrainLoop,
                              LogProcessor, Runner, TestLoop, ValLoop)
-from mmengine.runner.loops import _InfiniteDataloaderIterator
+from mmengine.runner.loops import (_copy_data, _get_num_samples,
+                                   _InfiniteDataloaderIterator)
 from mmengine.runner.priority import Priority, get_priority
+from mmengine.structures import BaseDataElement
 from mmengine.utils import digit_version, is_list_of
 from mmengine.utils.dl_utils import TORCH_VERSION
 from mmengine.visualization import Visualizer
@@ -209,6 +214,15 @@ class ToyDatasetNoMeta(Dataset):
         return dict(inputs=self.data[index], data_sample=self.label[index])
 
 
+class ToyIterableDataset(IterableDataset):
+    data = torch.randn(12, 2)
+    label = torch.ones(12)
+
+    def __iter__(self):
+        for inputs, data_sample in zip(self.data, self.label):
+            yield dict(inputs=inputs, data_sample=data_sample)
+
+
 class ToyMetric1(BaseMetric):
 
     def __init__(self, collect_device='cpu', dummy_metrics=None):
@@ -1330,6 +1344,8 @@ class TestRunner(TestCase):
         cfg = dict(type='EpochBasedTrainLoop', max_epochs=3)
         loop = runner.build_train_loop(cfg)
         self.assertIsInstance(loop, EpochBasedTrainLoop)
+        self.assertEqual(loop.iters_per_epoch, len(loop.dataloader))
+        self.assertEqual(loop.max_iters, 3 * loop.iters_per_epoch)
 
         cfg = dict(type='IterBasedTrainLoop', max_iters=3)
         loop = runner.build_train_loop(cfg)
@@ -1385,6 +1401,20 @@ class TestRunner(TestCase):
         loop = runner.build_val_loop(cfg)
         self.assertIsInstance(loop, CustomValLoop)
 
+        # test default arguments of the dataloader built from a dict
+        self.assertEqual(loop.dataloader.pin_memory, is_cuda_available())
+        self.assertFalse(loop.dataloader.persistent_workers)
+        runner._val_dataloader = dict(
+            dataset=dict(type='ToyDataset'),
+            sampler=dict(type='DefaultSampler', shuffle=False),
+            batch_size=3,
+            num_workers=1)
+        loop = runner.build_val_loop(dict())
+        self.assertTrue(loop.dataloader.persistent_workers)
+        runner._val_dataloader['persistent_workers'] = False
+        loop = runner.build_val_loop(dict())
+        self.assertFalse(loop.dataloader.persistent_workers)
+
     def test_build_test_loop(self):
         cfg = copy.deepcopy(self.epoch_based_cfg)
         cfg.experiment_name = 'test_build_test_loop'
@@ -1412,6 +1442,10 @@ class TestRunner(TestCase):
         loop = runner.build_val_loop(cfg)
         self.assertIsInstance(loop, CustomTestLoop)
 
+        # evaluator should be one of dict, list or Evaluator instance
+        with self.assertRaisesRegex(AssertionError, 'evaluator must be'):
+            TestLoop(runner, runner._test_dataloader, evaluator='invalid')
+
     def test_build_log_processor(self):
         cfg = copy.deepcopy(self.epoch_based_cfg)
         cfg.experiment_name = 'test_build_log_processor'
@@ -1835,6 +1869,112 @@ class TestRunner(TestCase):
         runner.train()
         self.assertEqual(runner.iter, 3 * 2)
 
+        # 16. test prefetching batches
+        for cfg in (self.epoch_based_cfg, self.iter_based_cfg):
+            cfg = copy.deepcopy(cfg)
+            cfg.experiment_name = 'test_train16'
+            cfg.train_cfg.prefetch = True
+            cfg.train_cfg.memory_format = 'channels_last'
+            cfg.val_cfg = dict(prefetch=True)
+            runner = Runner.from_cfg(cfg)
+            runner.train()
+            self.assertEqual(runner.iter, 12)
+
+        # 17. test capturing CUDA graph in IterBasedTrainLoop
+        # batches are copied into the captured batch only if they match
+        static_batch = dict(
+            inputs=[torch.zeros(4, 3)] * 3, data_samples=torch.zeros(4))
+        batch = dict(inputs=[torch.ones(4, 3)] * 3, data_samples=torch.ones(4))
+        _copy_data(static_batch, batch)
+        self.assertTrue(
+            torch.equal(static_batch['inputs'][2], batch['inputs'][2]))
+        for batch, msg in [
+            (dict(inputs=[torch.ones(4, 3)],
+                  data_samples=torch.ones(4)), 'length 3 but got 1'),
+            (dict(inputs=[torch.ones(1, 3)] * 3,
+                  data_samples=torch.ones(4)), r'shape \(4, 3\)'),
+            (dict(inputs=[torch.ones(4, 3)] * 3), 'keys'),
+            (dict(inputs=torch.ones(4, 3),
+                  data_samples=torch.ones(4)), 'expect <class'),
+        ]:
+            with self.assertRaisesRegex(ValueError, msg):
+                _copy_data(static_batch, batch)
+
+        cfg = copy.deepcopy(self.iter_based_cfg)
+        cfg.experiment_name = 'test_train17'
+        cfg.train_cfg.capture_cuda_graph = True
+        runner = Runner.from_cfg(cfg)
+        if is_cuda_available():
+            # parameter schedulers are frozen in the graph
+            with self.assertLogs(
+                    MMLogger.get_current_instance(), level='WARNING') as cm:
+                runner.train()
+            self.assertTrue(
+                any('Parameter schedulers' in line for line in cm.output))
+            self.assertIsNotNone(runner.train_loop._graph)
+        else:
+            runner.train()
+        self.assertEqual(runner.iter, 12)
+        self.assertEqual(runner.train_loop.capture_cuda_graph,
+                         is_cuda_available())
+
+        # the training configuration is checked before capturing
+        cfg = copy.deepcopy(self.iter_based_cfg)
+        cfg.experiment_name = 'test_train17_check'
+        runner = Runner.from_cfg(cfg)
+        train_loop = runner.train_loop
+        optim_wrapper_cfgs = [
+            (dict(optimizer=dict(type='SGD', lr=0.01)), None),
+            (dict(
+                optimizer=dict(type='SGD', lr=0.01),
+                clip_grad=dict(max_norm=1)), 'gradient clipping'),
+            (dict(optimizer=dict(type='SGD', lr=0.01),
+                  accumulative_counts=2), 'gradient accumulation'),
+        ]
+        # `capturable` of `Adam` is available since PyTorch 1.12.0
+        if digit_version(TORCH_VERSION) >= digit_version('1.12.0'):
+            optim_wrapper_cfgs += [
+                (dict(optimizer=dict(type='Adam', lr=0.01, capturable=True)),
+                 None),
+                (dict(optimizer=dict(type='Adam', lr=0.01)),
+                 'capturable=True'),
+            ]
+        for optim_wrapper, msg in optim_wrapper_cfgs:
+            runner.optim_wrapper = runner.build_optim_wrapper(optim_wrapper)
+            if msg is None:
+                train_loop._check_graph_capture()
+            else:
+                with self.assertRaisesRegex(AssertionError, msg):
+                    train_loop._check_graph_capture()
+        # distributed training and model wrappers are not supported
+        runner.optim_wrapper = runner.build_optim_wrapper(
+            dict(optimizer=dict(type='SGD', lr=0.01)))
+        runner.model = nn.DataParallel(runner.model)
+        with self.assertRaisesRegex(AssertionError, 'DataParallel'):
+            train_loop._check_graph_capture()
+
+        if is_cuda_available():
+            # the last incomplete batch does not match the captured batch
+            cfg = copy.deepcopy(self.iter_based_cfg)
+            cfg.experiment_name = 'test_train17_drop_last'
+            cfg.train_cfg.capture_cuda_graph = True
+            cfg.train_dataloader.batch_size = 5
+            runner = Runner.from_cfg(cfg)
+            with self.assertRaisesRegex(ValueError, 'does not match'):
+                runner.train()
+
+    def test_infinite_dataloader_iterator(self):
+        dataloader = MagicMock(persistent_workers=True)
+        dataloader.__iter__.side_effect = lambda: iter([1, 2])
+        with patch('mmengine.runner.loops.time.sleep') as mock_sleep:
+            iterator = _InfiniteDataloaderIterator(dataloader)
+            self.assertEqual([next(iterator) for _ in range(3)], [1, 2, 1])
+            # Do not wait at the epoch transition if workers are persistent
+            mock_sleep.assert_not_called()
+            dataloader.persistent_workers = False
+            self.assertEqual([next(iterator) for _ in range(2)], [2, 1])
+            mock_sleep.assert_called_once_with(2)
+
     @skipIf(
         SKIP_TEST_COMPILE,
         reason='torch.compile is not valid, please install PyTorch>=2.0.0')
@@ -1947,6 +2087,63 @@ class TestRunner(TestCase):
         runner.val()
         self.assertEqual(val_result, 2)
 
+        # test dataset without `__len__`
+        cfg = copy.deepcopy(self.epoch_based_cfg)
+        cfg.experiment_name = 'test_val5'
+        # `IterTimerHook` and `LoggerHook` need the length of dataloader
+        cfg.default_hooks.timer = None
+        cfg.default_hooks.logger = None
+        runner = Runner.from_cfg(cfg)
+        runner._val_loop = ValLoop(
+            runner,
+            DataLoader(
+                ToyIterableDataset(), batch_size=5, collate_fn=pseudo_collate),
+            evaluator=dict(type='ToyMetric1'))
+        with patch.object(
+                runner.val_loop.evaluator,
+                'evaluate',
+                wraps=runner.val_loop.evaluator.evaluate) as evaluate:
+            runner.val()
+            evaluate.assert_called_once_with(12)
+
+        # samples are counted along the batch dimension
+        data_batches = [
+            dict(
+                inputs=[torch.rand(3)] * 8,
+                data_samples=[BaseDataElement()] * 8),
+            dict(
+                inputs=torch.rand(8, 3), data_samples=[BaseDataElement()] * 8),
+            dict(inputs=dict(img=[torch.rand(3)] * 8)),
+            [torch.rand(8, 3), torch.rand(8)],
+            (torch.rand(8, 3), torch.rand(8)),
+            [[torch.rand(3)] * 8, [torch.rand(1)] * 8],
+            torch.rand(8, 3),
+        ]
+        for data_batch in data_batches:
+            self.assertEqual(_get_num_samples(data_batch), 8)
+
+    @skipIf(
+        digit_version(TORCH_VERSION) < digit_version('1.9.0'),
+        reason='torch.inference_mode is available since PyTorch 1.9.0')
+    def test_val_inference_mode(self):
+        # validation runs under `torch.no_grad` by default since it may run
+        # in the middle of training
+        predictions = []
+
+        def get_outputs_callback(module, inputs, outputs):
+            predictions.append(outputs)
+
+        for inference_mode in (False, True):
+            cfg = copy.deepcopy(self.epoch_based_cfg)
+            cfg.experiment_name = f'test_val_inference_mode_{inference_mode}'
+            if inference_mode:
+                cfg.val_cfg = dict(inference_mode=True)
+            runner = Runner.from_cfg(cfg)
+            runner.model.register_forward_hook(get_outputs_callback)
+            runner.val()
+            self.assertFalse(predictions[-1].requires_grad)
+            self.assertEqual(predictions[-1].is_inference(), inference_mode)
+
     @skipIf(
         SKIP_TEST_COMPILE,
         reason='torch.compile is not valid, please install PyTorch>=2.0.0')
@@ -2003,6 +2200,9 @@ class TestRunner(TestCase):
         runner.model.register_forward_hook(get_outputs_callback)
         runner.test()
         self.assertEqual(predictions[0].dtype, torch.float32)
+        # test runs under `torch.inference_mode` by default
+        if digit_version(TORCH_VERSION) >= digit_version('1.9.0'):
+            self.assertTrue(predictions[0].is_inference())
         predictions.clear()
 
         # Test fp16 `autocast` context.
@@ -2027,6 +2227,40 @@ class TestRunner(TestCase):
             self.assertIsInstance(runner._train_loop, dict)
             self.assertIsInstance(runner._val_loop, dict)
 
+        # test async_process
+        cfg = copy.deepcopy(self.epoch_based_cfg)
+        cfg.experiment_name = 'test_test5'
+        cfg.test_cfg = dict(async_process=True)
+        runner = Runner.from_cfg(cfg)
+        evaluator = runner.test_loop.evaluator
+        process = evaluator.process
+        thread_ids = []
+        batches = []
+        grad_enabled = []
+        devices = []
+
+        def process_in_thread(data_samples, data_batch=None):
+            thread_ids.append(threading.get_ident())
+            batches.append(data_batch)
+            grad_enabled.append(torch.is_grad_enabled())
+            if is_cuda_available():
+                devices.append(torch.cuda.current_device())
+            process(data_samples, data_batch)
+
+        evaluator.process = process_in_thread
+        self.assertEqual(runner.test(), dict(acc=1))
+        self.assertEqual(len(batches), len(runner.test_dataloader))
+        self.assertNotIn(threading.get_ident(), thread_ids)
+        # grad mode and the CUDA device are thread local
+        self.assertFalse(any(grad_enabled))
+        if is_cuda_available():
+            self.assertEqual(set(devices), {torch.cuda.current_device()})
+
+        # errors raised by `evaluator.process` should be re-raised
+        evaluator.process = MagicMock(side_effect=ValueError('process'))
+        with self.assertRaisesRegex(ValueError, 'process'):
+            runner.test()
+
         # test num_batch_per_epoch
         test_result = 0
 
@@ -2131,6 +2365,76 @@ class TestRunner(TestCase):
         self.assertEqual(
             get_priority(runner._hooks[3].priority), get_priority('VERY_LOW'))
 
+    def test_call_hook(self):
+        cfg = copy.deepcopy(self.epoch_based_cfg)
+        cfg.experiment_name = 'test_call_hook'
+        cfg.default_hooks = dict(
+            runtime_info=None,
+            timer=None,
+            sampler_seed=None,
+            logger=None,
+            param_scheduler=None,
+            checkpoint=None)
+        runner = Runner.from_cfg(cfg)
+        self.assertEqual(len(runner._hooks), 0)
+
+        # hooks which do not override the method will not be called
+        results = []
+        hook = ToyHook()
+        runner.register_hook(hook)
+        runner.call_hook('before_train_epoch')
+        runner.call_hook('after_train_epoch')
+        self.assertEqual(runner._triggered_hooks['before_train_epoch'], [hook])
+        self.assertEqual(runner._triggered_hooks['after_train_epoch'], [])
+
+        # registering a new hook resets the triggered hooks
+        hook2 = ToyHook2()
+        hook2.before_train_epoch = lambda runner: results.append('before')
+        runner.register_hook(hook2)
+        self.assertEqual(runner._triggered_hooks, {})
+        runner.call_hook('before_train_epoch')
+        runner.call_hook('after_train_epoch')
+        self.assertEqual(runner._triggered_hooks['before_train_epoch'],
+                         [hook, hook2])
+        self.assertEqual(runner._triggered_hooks['after_train_epoch'], [hook2])
+        self.assertEqual(results, ['before'])
+
+        # custom hook methods
+        hook.before_warmup_iter = lambda runner: results.append('warmup')
+        runner.call_hook('before_warmup_iter')
+        self.assertEqual(results, ['before', 'warmup'])
+
+        # hook callers bind the methods again after a hook is registered
+        hook_caller = runner._make_hook_caller('before_train_epoch')
+        hook_caller()
+        self.assertEqual(results, ['before', 'warmup', 'before'])
+        hook3 = ToyHook2()
+        hook3.before_train_epoch = lambda runner: results.append('before3')
+        runner.register_hook(hook3)
+        hook_caller()
+        self.assertEqual(results[-2:], ['before', 'before3'])
+
+        # hooks added to or removed from `runner.hooks` directly are detected
+        runner.hooks.remove(hook3)
+        hook_caller()
+        self.assertEqual(results[-2:], ['before3', 'before'])
+        runner.hooks.append(hook3)
+        runner.call_hook('before_train_epoch')
+        self.assertEqual(results[-2:], ['before', 'before3'])
+        runner._hooks = [hook3]
+        hook_caller()
+        self.assertEqual(results[-2:], ['before3', 'before3'])
+
+        # `call_hook` overridden by subclasses should be respected
+        class ToyRunner(Runner):
+
+            def call_hook(self, fn_name, **kwargs):
+                results.append((fn_name, kwargs))
+
+        runner.__class__ = ToyRunner
+        runner._make_hook_caller('before_train_epoch')(a=1)
+        self.assertEqual(results[-1], ('before_train_epoch', dict(a=1)))
+
     def test_default_hooks(self):
         cfg = copy.deepcopy(self.epoch_based_cfg)
         cfg.experiment_name = 'test_default_hooks'
@@ -2260,6 +2564,26 @@ class TestRunner(TestCase):
             self.assertEqual(before, 'before')
             self.assertEqual(after, 'after')
 
+        # test custom loop which overrides `run_iter(data_batch)`
+        iter_results = []
+
+        @LOOPS.register_module(force=True)
+        class CustomTrainLoop3(IterBasedTrainLoop):
+
+            def run_iter(self, data_batch):
+                iter_results.append(self.iter)
+                super().run_iter(data_batch)
+
+        cfg = copy.deepcopy(self.iter_based_cfg)
+        cfg.experiment_name = 'test_custom_loop_run_iter'
+        cfg.train_cfg = dict(
+            type='CustomTrainLoop3', max_iters=10, val_interval=4)
+        cfg.custom_hooks = []
+        runner = Runner.from_cfg(cfg)
+        runner.train()
+        self.assertEqual(iter_results, list(range(10)))
+        self.assertEqual(runner.iter, 10)
+
     def test_checkpoint(self):
         # 1. test epoch based
         cfg = copy.deepcopy(self.epoch_based_cfg)
@@ -310,6 +310,19 @@ class TestBaseDataElement(TestCase):
         cuda_instances = instances.to('cuda:0')
         self.check_data_device(cuda_instances, 'cuda:0')
 
+    @pytest.mark.skipif(
+        not torch.cuda.is_available(), reason='GPU is required!')
+    def test_pin_memory(self):
+        metainfo, data = self.setup_data()
+        instances = BaseDataElement(metainfo=metainfo, **data)
+
+        pinned_instances = instances.pin_memory()
+        self.check_data_device(pinned_instances, 'cpu')
+        assert pinned_instances.gt_instances.bboxes.is_pinned()
+        assert pinned_instances.pred_instances.scores.is_pinned()
+        assert self.is_equal(pinned_instances.gt_instances.bboxes,
+                             instances.gt_instances.bboxes)
+
     def test_cpu(self):
         metainfo, data = self.setup_data()
         instances = BaseDataElement(metainfo=metainfo, **data)